@@ -0,0 +1 @@
+from book_service.core import *
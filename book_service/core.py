@@ -0,0 +1,472 @@
+"""Wspolne klasy serwisow do zarzadzania ksiazkami w bibliotece cyfrowej."""
+from dataclasses import dataclass, field
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Protocol
+from enum import Enum
+from pathlib import Path
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import ijson
+import numpy as np
+
+# SIMD-accelerated JSON codecs, with the stdlib as fallback on platforms
+# without wheels.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+    _SIMDJSON_PARSER = simdjson.Parser()
+except ImportError:
+    simdjson = None
+
+# Numba-compiled range count over the year column: LLVM vectorizes the
+# compare loop into packed SIMD with multi-threading. Optional - the plain
+# NumPy expression stays as fallback.
+try:
+    from numba import njit, prange
+
+    @njit('int64(int16[:], int64, int64)', cache=True, parallel=True)
+    def _count_in_range(years: np.ndarray, lo: int, hi: int) -> int:
+        count = 0
+        for i in prange(years.shape[0]):
+            if lo <= years[i] <= hi:
+                count += 1
+        return count
+except ImportError:
+    _count_in_range = None
+
+BookData = dict[str, str | int | float]
+JsonWriteData = str | dict[str, Any] 
+
+class BookCategory(Enum):
+    UNKNOWN = "Unknown"
+    FICTION = "Fiction"
+    NON_FICTION = "Non-fiction"
+    SCIENCE = "Science"
+    FANTASY = "Fantasy"
+    SELF_HELP = "Self-help"
+
+_MIN_YEAR = 1900
+_MAX_YEAR = 2025
+
+_CATEGORY_VALUES = frozenset(c.value for c in BookCategory)
+_CAT_BY_VALUE = {c.value: c for c in BookCategory}
+_CAT_TO_INT = {c: i for i, c in enumerate(BookCategory)}
+
+
+_BOOK_FIELDS = ('title', 'desc', 'author', 'year', 'pages', 'price', 'category')
+_BOOK_GETTER = itemgetter(*_BOOK_FIELDS)
+
+@dataclass(slots=True)
+class Book:
+    title: str
+    desc: str
+    author: str
+    year: int
+    pages: int
+    price: float = 0.0
+    category: BookCategory = field(default_factory=lambda: BookCategory.UNKNOWN)
+
+    def has_category(self, category: BookCategory) -> bool:
+        return self.category == category
+
+    def is_betweeen(self, from_year: int, to_year: int) -> bool:
+        return from_year <= self.year <= to_year
+
+    def __str__(self) -> str:
+        return f'Book(Title: {self.title}, author: {self.author}, year: {self.year}, '\
+            f'pages {self.pages}, price: {self.price}, category: {self.category.name}'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    @classmethod
+    def from_records(cls, records: list[BookData]) -> list['Book']:
+        # Batched constructor: itemgetter extracts all fields per record in
+        # one C call, so the per-record Python work is just Book.__init__.
+        # Records are assumed validated.
+        category_by_value = _CAT_BY_VALUE
+        unknown = BookCategory.UNKNOWN
+        return [
+            cls(title, desc, author, year, pages, float(price),
+                category_by_value.get(category, unknown))
+            for title, desc, author, year, pages, price, category
+            in map(_BOOK_GETTER, records)
+        ]
+
+    def to_dict(self) -> dict[str, str]:
+        return {
+            'title': self.title,
+            'desc': self.desc,
+            'author': self.author,
+            'year': str(self.year),
+            'pages': str(self.pages),
+            'price': str(self.price),
+            'category': self.category.name
+        }
+                
+        
+class FileReadService[T](Protocol):
+
+    def read(self, file_name:str) -> Iterable[T]:
+        ...
+
+
+# Below this size a single read + parse beats streaming; above it, streaming
+# keeps peak memory flat and lets processing start before the file ends.
+_STREAM_THRESHOLD_BYTES = 1 << 20
+# Up to this size the file is mmapped and parsed from the contiguous buffer;
+# beyond it the streaming path wins on peak memory.
+_MMAP_THRESHOLD_BYTES = 256 << 20
+
+class JsonFileReader(FileReadService[BookData]):
+
+    def read(self, file_name: str) -> Iterable[BookData]:
+        size = os.path.getsize(file_name)
+        if size <= _STREAM_THRESHOLD_BYTES:
+            if simdjson is not None:
+                return _SIMDJSON_PARSER.load(file_name).as_list()
+            return json.loads(Path(file_name).read_bytes())
+        if simdjson is not None and size <= _MMAP_THRESHOLD_BYTES:
+            # Parse straight out of the page cache: no read syscalls and no
+            # intermediate copy between the kernel and the SIMD scanner.
+            with open(file_name, 'rb') as json_file:
+                with mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return _SIMDJSON_PARSER.parse(mapped).as_list()
+        # use_float=True: plain floats instead of ijson's default Decimal,
+        # matching what json.loads produces.
+        return ijson.items(open(file_name, 'rb', buffering=64 * 1024), 'item', use_float=True)
+
+
+class FileWriteService[T](Protocol):
+
+    def write(self, file_name: str, data: T) -> None:
+        ...
+
+class JsonFileWriter(FileWriteService[JsonWriteData]):
+
+    def write(self, file_name: str, data: JsonWriteData) -> None:
+        if orjson is not None:
+            # Serialize to one bytes buffer, then a single write syscall on a
+            # raw fd - no TextIOWrapper buffering layer in between.
+            buf = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            fd = os.open(file_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, buf)
+            finally:
+                os.close(fd)
+            return
+        with open(file_name, 'w', encoding='UTF8') as json_file:
+            json.dump(data, json_file, indent=4, ensure_ascii=False)
+
+# Validation
+class Validator[T](Protocol):
+
+    def validate(self, data: T) -> bool:
+        ...
+
+    @staticmethod
+    def is_possitive_number(n: int | float) -> bool:
+        return float(n) > 0.0
+
+    @staticmethod
+    def is_between(n: int, left: int, right: int) -> bool:
+        return left <= n <= right
+
+# Dispatch table built once at module load: every field is checked exactly once,
+# instead of re-validating year/pages/price/category on each field iteration.
+_VALIDATOR_TABLE: list[tuple[str, type | tuple[type, ...], Callable[[Any], bool] | None]] = [
+    ('title', str, None),
+    ('desc', str, None),
+    ('author', str, None),
+    ('year', int, lambda v: Validator.is_between(v, _MIN_YEAR, _MAX_YEAR)),
+    ('pages', int, Validator.is_possitive_number),
+    ('price', (float, int), Validator.is_possitive_number),
+    ('category', str, lambda v: v in _CATEGORY_VALUES),
+]
+
+class BookValidator(Validator[BookData]):
+
+    def validate(self, data: BookData) -> bool:
+        # Lazy %-style arguments: nothing is formatted unless the record is
+        # actually logged, and the full record dump is left to the caller.
+        for field_name, required_type, extra_check in _VALIDATOR_TABLE:
+            value = data.get(field_name)
+            if not value:
+                logging.error('Missing or empty field %s', field_name)
+                return False
+            if not isinstance(value, required_type):
+                logging.error('Field %s has wrong type: %r', field_name, value)
+                return False
+            if extra_check is not None and not extra_check(value):
+                logging.error('Field %s has invalid value: %r', field_name, value)
+                return False
+        return True
+
+
+class Converter[T, U](Protocol):
+
+    def from_json(self, data: T) -> U:
+        ...
+
+    def to_json(self, data: U) -> T:
+        ...
+
+class BookConverter(Converter[BookData, Book]):
+
+    def from_json(self, data: BookData) -> Book:
+
+        # One itemgetter call binds every field to a local - no repeated
+        # dict probes below this line.
+        title, desc, author, year, pages, price, category = _BOOK_GETTER(data)
+
+        return Book(
+            title=str(title),
+            desc=str(desc),
+            author=str(author),
+            year=int(year),
+            pages=int(pages),
+            price=float(price),
+            # Dict lookup instead of the BookCategory(...) constructor - no
+            # enum dispatch and no exception path on an unknown category.
+            category=_CAT_BY_VALUE.get(category, BookCategory.UNKNOWN)
+        )
+
+    def to_json(self, data: Book) -> BookData:
+
+        return {
+        # return data.__dict__ | {'category' : data.category.name}
+            'title': data.title,
+            'desc': data.desc,
+            'author': data.author,
+            'year': data.year,  
+            'pages': data.pages,
+            'price': data.price,
+            'category': data.category.value
+        }
+
+
+# Below this many records the pool startup costs more than it saves.
+_PARALLEL_THRESHOLD = 10_000
+
+def _validate_convert_chunk(validator: Validator[BookData],
+                            chunk: list[BookData]) -> tuple[list[Book], int]:
+    # Module-level so it can be pickled into worker processes.
+    valid_entries = [entry for entry in chunk if validator.validate(entry)]
+    return Book.from_records(valid_entries), len(chunk) - len(valid_entries)
+
+
+@dataclass
+class BookRepository:
+    file_read_service: FileReadService[BookData]
+    validator: Validator[BookData]
+    converter: Converter[BookData, Book]
+    file_name: str | None = None
+    books: list[Book] = field(default_factory=list, init=False)
+    _years: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int16), init=False)
+    _year_hist: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64), init=False)
+    by_category: dict[BookCategory, list[Book]] = field(default_factory=dict, init=False)
+    columns: dict[str, np.ndarray] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        if self.file_name is None:
+            raise ValueError('Default file name not set')
+        self.load_book()
+
+    def get_books(self) -> list[Book]:
+        if not self.books:
+            logging.info('No books in cache')
+        return self.books
+
+    def load_book(self, file_name: str | None = None) -> list[Book]:
+        if file_name is None:
+            logging.warning('Applied default file name')
+
+            # way 1
+            # if self.file_name is None:
+            #     raise ValueError('No default fale name set')
+            # file_name = self.file_name
+
+            # way 2
+            # assert isinstance(self.file_name, str), 'File name must be string'
+            # file_name = self.file_name
+
+            # way 3
+            file_name = str(self.file_name)
+
+        logging.info(f'Load book started from file {file_name}')
+        raw_data = self.file_read_service.read(file_name)
+        self.books = self._process_data(raw_data)
+        return self.books
+        
+
+    def count_year_range(self, year_from: int, year_to: int) -> int:
+        if self._year_hist.size:
+            # O(range width) sum over the precomputed histogram instead of a
+            # scan over all years. Validation bounds years to 1900-2025, so
+            # clamping the slice to the histogram is lossless.
+            lo = max(year_from - _MIN_YEAR, 0)
+            hi = max(year_to - _MIN_YEAR + 1, 0)
+            return int(self._year_hist[lo:hi].sum())
+        if _count_in_range is not None:
+            return int(_count_in_range(self._years, year_from, year_to))
+        return int(((self._years >= year_from) & (self._years <= year_to)).sum())
+
+    def category_row_indices(self, category: BookCategory) -> np.ndarray:
+        return np.flatnonzero(self.columns['category'] == _CAT_TO_INT[category])
+
+    def _process_data_parallel(self, raw_data: list[BookData]) -> tuple[list[Book], int]:
+        workers = os.cpu_count() or 1
+        chunk_size = -(-len(raw_data) // workers)
+        chunks = [raw_data[i:i + chunk_size] for i in range(0, len(raw_data), chunk_size)]
+        valid_book: list[Book] = []
+        invalid_count = 0
+        # forkserver: plain fork would inherit Numba's threading-layer state
+        # and the workers then hang on exit.
+        context = multiprocessing.get_context('forkserver')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for books, invalid in pool.map(partial(_validate_convert_chunk, self.validator), chunks):
+                valid_book.extend(books)
+                invalid_count += invalid
+        return valid_book, invalid_count
+
+    def _process_data(self, raw_data: Iterable[BookData]) ->list[Book]:
+        if isinstance(raw_data, list) and len(raw_data) > _PARALLEL_THRESHOLD:
+            # Validation and conversion share no state, so large batches are
+            # split across worker processes and scale with the core count.
+            # The streaming (iterator) path stays serial to keep memory flat.
+            valid_book, invalid_count = self._process_data_parallel(raw_data)
+        else:
+            valid_entries = []
+            invalid_count = 0
+            for entry in raw_data:
+                if self.validator.validate(entry):
+                    valid_entries.append(entry)
+                else:
+                    invalid_count += 1
+            valid_book = Book.from_records(valid_entries)
+        if invalid_count:
+            # One summary line instead of dumping every rejected record.
+            logging.error('Skipped %d invalid entries during load', invalid_count)
+        # Year column cached as a compact int array, so range counts are a
+        # single vectorized compare instead of a Python loop. Rebuilt on
+        # every load_book, so it never goes stale.
+        self._years = np.fromiter((book.year for book in valid_book), dtype=np.int16)
+        count = len(valid_book)
+        # Year histogram from the same pass: every later range count is an
+        # O(range width) slice sum, fusing the report's five scans into none.
+        self._year_hist = (np.bincount(self._years - _MIN_YEAR, minlength=_MAX_YEAR - _MIN_YEAR + 1)
+                           if count else np.empty(0, dtype=np.int64))
+        # SoA view of the library: per-column arrays scan linearly and
+        # vectorize, unlike pointer-chasing through a list of Book objects.
+        # The books list stays as the materialized form for print paths.
+        self.columns = {
+            'title': np.fromiter((book.title for book in valid_book), dtype=object, count=count),
+            'year': self._years,
+            'pages': np.fromiter((book.pages for book in valid_book), dtype=np.int32, count=count),
+            'category': np.fromiter((_CAT_TO_INT[book.category] for book in valid_book),
+                                    dtype=np.int8, count=count),
+        }
+        # Category buckets built in the same pass - filtering by category
+        # becomes a dict lookup instead of a full scan per category.
+        by_category: dict[BookCategory, list[Book]] = defaultdict(list)
+        for book in valid_book:
+            by_category[book.category].append(book)
+        self.by_category = dict(by_category)
+        return valid_book
+
+
+@dataclass
+class  LibraryService:
+    books_repository: BookRepository
+
+    # def filter_books_category(self, category: BookCategory) -> list[Book]:
+        # return list(filter(lambda book: book.category == category, self.books_repository.get_books()))
+
+    # def filter_books_category(self, category: BookCategory) -> list[Book]:
+    #     return [book for book in self.books_repository.get_books() if book.category == category]
+
+    # def filter_books_category(self, category: BookCategory) -> list[Book]:
+    #     return [book for book in self.books_repository.get_books() if book.has_category(category)]
+
+    # def count_books_year_range(self, year_from: int, year_to: int) -> int:
+    #     return sum(1 for book in self.books_repository.get_books() if book.is_betweeen(year_from, year_to))
+
+    # def count_books_year_range(self, year_from: int, year_to: int) -> int:
+    #     return sum(1 for book in self.books_repository.get_books() if year_from <= book.year <= year_to)
+
+    def filter_books_category(self, category: BookCategory) -> list[Book]:
+        return self.books_repository.by_category.get(category, [])
+
+    def count_books_year_range(self, year_from: int, year_to: int) -> int:
+        return self.books_repository.count_year_range(year_from, year_to)
+
+    def filter_books_year_range(self, year_from: int, year_to: int) -> list[Book]:
+        # Specialized variant of filter_books: the comparison is inlined and
+        # append/list hoisted to locals, so there is no Python call per book.
+        result: list[Book] = []
+        append = result.append
+        for book in self.books_repository.get_books():
+            if year_from <= book.year <= year_to:
+                append(book)
+        return result
+
+    def filter_books(self, condition_fn: Callable[[Book], bool]) -> list[Book]:
+        return [book for book in self.books_repository.get_books() if condition_fn(book)]
+
+# Iteration constants for the reports: iterating the Enum class allocates a
+# fresh list via EnumMeta.__iter__ on every pass, so do it once here.
+_CATEGORIES = tuple(BookCategory)
+_CATEGORY_NAMES = tuple(c.name for c in _CATEGORIES)
+_YEAR_STARTS = tuple(range(2000, 2025, 5))
+
+@dataclass
+class ReportService:
+    library_services:LibraryService
+
+    def get_report_on_console(self) -> None:
+
+        for book_category in _CATEGORIES:
+            print(book_category)
+            filtered_books = self.library_services.filter_books_category(book_category)
+            for filtered_book in filtered_books:
+                print(filtered_book)
+
+        for start_year in _YEAR_STARTS:
+            end_year = start_year + 10
+            print(f'Years : {start_year} and {end_year} : {self.library_services.count_books_year_range(start_year, end_year)}')
+
+    def get_report_file(self, file_name: str, file_write_service: FileWriteService) -> None:
+        dict_book_category = {}
+        for book_category, category_name in zip(_CATEGORIES, _CATEGORY_NAMES):
+            filtered_books = self.library_services.filter_books_category(book_category)
+            dict_book_category[category_name] = [book.to_dict() for book in filtered_books]
+
+        dict_years_data = {}
+        for start_year in _YEAR_STARTS:
+            end_year = start_year + 9
+            dict_years_data[f'{start_year}-{end_year}'] = self.library_services.count_books_year_range(start_year,end_year)
+
+        data = {
+            'categories': dict_book_category,
+            'years': dict_years_data
+        }
+        file_write_service.write(file_name,data)
+                
+
+
+__all__ = [
+    'BookData', 'JsonWriteData', 'BookCategory', 'Book',
+    'FileReadService', 'JsonFileReader', 'FileWriteService', 'JsonFileWriter',
+    'Validator', 'BookValidator', 'Converter', 'BookConverter',
+    'BookRepository', 'LibraryService', 'ReportService',
+]